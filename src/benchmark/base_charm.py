@@ -17,7 +17,7 @@ This charm should also be the main entry point to all the modelling of your benc
 import logging
 import subprocess
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Sequence
 
 import ops
 from charms.grafana_agent.v0.cos_agent import COSAgentProvider
@@ -131,7 +131,7 @@ class DPBenchmarkCharmBase(ops.CharmBase, ABC):
         self.lifecycle = LifecycleManager(self.peers, self.config_manager)
 
     @abstractmethod
-    def supported_workloads(self) -> list[str]:
+    def supported_workloads(self) -> Sequence[str]:
         """List of supported workloads."""
         ...
 
@@ -0,0 +1,39 @@
+# Copyright 2024 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""This module contains a small cache for values that may change outside of the charm.
+
+Such values, e.g. the state of a service or the files on disk, cannot be trusted for the
+whole hook. Instead, they are reused for a short while and dropped whenever the charm
+itself changes them.
+"""
+
+import time
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """Holds a single value for up to ttl seconds.
+
+    If computing the value raises, nothing is cached and the next call tries again.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # Expiry time of the cached value and the value itself
+        self._entry: tuple[float, T] | None = None
+
+    def get(self, compute: Callable[[], T]) -> T:
+        """Returns the cached value, or calls compute to refresh it once it has expired."""
+        now = time.monotonic()
+        if self._entry and now < self._entry[0]:
+            return self._entry[1]
+        value = compute()
+        self._entry = (now + self.ttl, value)
+        return value
+
+    def clear(self) -> None:
+        """Drops the cached value, the next call to get recomputes it."""
+        self._entry = None
@@ -13,7 +13,7 @@ from typing import Any, Optional
 
 from ops.model import Application, Relation, Unit
 from overrides import override
-from pydantic import BaseModel, error_wrappers, root_validator
+from pydantic import BaseModel, error_wrappers, root_validator, validator
 
 from benchmark.literals import (
     LIFECYCLE_KEY,
@@ -72,6 +72,14 @@ class DPBenchmarkBaseDatabaseModel(BaseModel):
     db_name: str
     tls: str | None = None
     tls_ca: str | None = None
+    # The hosts as a comma-separated string, computed once from `hosts`
+    target_hosts: str = ""
+
+    @validator("target_hosts", always=True)
+    @classmethod
+    def join_target_hosts(cls, _, values):
+        """Join the hosts into the comma-separated target_hosts."""
+        return ",".join(values.get("hosts") or [])
 
     @root_validator(pre=False, skip_on_failure=True)
     @classmethod
@@ -255,6 +263,6 @@ class DatabaseState(RelationState):
                 tls_ca=self.tls_ca,
             )
         except error_wrappers.ValidationError as e:
-            logger.warning(f"Failed to validate the database model: {e}")
+            logger.warning("Failed to validate the database model: %s", e)
             entries = [entry.get("loc")[0] for entry in e.errors()]
             raise DPBenchmarkMissingOptionsError(f"{entries}")
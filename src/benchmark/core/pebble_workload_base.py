@@ -24,6 +24,7 @@ class DPBenchmarkPebbleTemplatePaths(WorkloadTemplatePaths):
     def __init__(self):
         super().__init__()
         self.svc_name = "dpe_benchmark"
+        self._param_dir = "/root/.benchmark/charmed_parameters"
 
     @property
     @override
@@ -35,9 +36,7 @@ class DPBenchmarkPebbleTemplatePaths(WorkloadTemplatePaths):
     @override
     def workload_params(self) -> str:
         """The path to the workload parameters folder."""
-        if not self.exists("/root/.benchmark/charmed_parameters"):
-            os.makedirs("/root/.benchmark/charmed_parameters", exist_ok=True)
-        return "/root/.benchmark/charmed_parameters/" + self.svc_name + ".json"
+        return f"{self._param_dir}/{self.svc_name}.json"
 
     @property
     @override
@@ -83,9 +82,9 @@ class DPBenchmarkPebbleWorkloadBase(WorkloadBase):
     @override
     def halt(self) -> bool:
         """Stop the benchmark service."""
-        if self.is_running():
+        if self.is_active():
             return service_stop(self.paths.svc_name)
-        return self.is_stopped()
+        return self.is_halted()
 
     @override
     def reload(self) -> bool:
@@ -115,6 +114,8 @@ class DPBenchmarkPebbleWorkloadBase(WorkloadBase):
             path: the full filepath to write to
             mode: the write mode. Usually "w" for write, or "a" for append. Default "w"
         """
+        # Only create the parent folder when we actually write to it
+        os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, mode) as f:
             f.write(content)
             os.chmod(path, 0o640)
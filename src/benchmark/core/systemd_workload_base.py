@@ -9,29 +9,54 @@ must implement most of the WorkloadBase methods.
 
 import os
 import subprocess
+from dataclasses import dataclass
+from functools import cached_property
 
 from charms.operator_libs_linux.v1.systemd import (
     daemon_reload,
-    service_failed,
     service_restart,
-    service_running,
     service_stop,
 )
 from overrides import override
 
+from benchmark.core.cache import TTLCache
 from benchmark.core.workload_base import (
     WorkloadBase,
     WorkloadTemplatePaths,
 )
 
+# The service state may change outside of the charm, so we only cache it for a short while
+SERVICE_STATE_TTL = 0.2  # in seconds
+
+
+@dataclass(frozen=True)
+class ServiceSnapshot:
+    """State of the benchmark service, as reported by a single systemctl call."""
+
+    active_state: str
+
+    @property
+    def running(self) -> bool:
+        """Whether the service is running."""
+        return self.active_state in ("active", "reloading")
+
+    @property
+    def failed(self) -> bool:
+        """Whether the service has failed."""
+        return self.active_state == "failed"
+
 
 class DPBenchmarkSystemdTemplatePaths(WorkloadTemplatePaths):
-    """Represents the benchmark service template paths."""
+    """Represents the benchmark service template paths.
+
+    The paths do not change while the charm runs, so each one is only built once.
+    """
 
     def __init__(self):
         super().__init__()
+        self._param_dir = "/root/.benchmark/charmed_parameters"
 
-    @property
+    @cached_property
     @override
     def service(self) -> str | None:
         """The optional path to the service file managing the script."""
@@ -43,25 +68,23 @@ class DPBenchmarkSystemdTemplatePaths(WorkloadTemplatePaths):
         """The service template file."""
         return "dpe_benchmark.service.j2"
 
-    @property
+    @cached_property
     @override
     def workload_params(self) -> str:
         """The path to the workload parameters folder."""
-        if not self.exists("/root/.benchmark/charmed_parameters"):
-            os.makedirs("/root/.benchmark/charmed_parameters", exist_ok=True)
-        return "/root/.benchmark/charmed_parameters/" + self.svc_name + ".json"
+        return f"{self._param_dir}/{self.svc_name}.json"
 
-    @property
+    @cached_property
     def results(self) -> str:
         """The path to the results folder."""
-        return "/root/.benchmark/charmed_parameters/results/"
+        return f"{self._param_dir}/results/"
 
     @override
     def exists(self, path: str) -> bool:
         """Check if the workload template paths exist."""
         return os.path.exists(path)
 
-    @property
+    @cached_property
     @override
     def templates(self) -> str:
         """The path to the workload template folder."""
@@ -77,28 +100,91 @@ class DPBenchmarkSystemdWorkloadBase(WorkloadBase):
     ):
         super().__init__(workload_params_template)
         self.paths = DPBenchmarkSystemdTemplatePaths()
+        self._svc_state: TTLCache[ServiceSnapshot] = TTLCache(SERVICE_STATE_TTL)
+
+    def _service_snapshot(self) -> ServiceSnapshot:
+        """Returns the state of the service with a single systemctl call.
+
+        systemd is only asked again once SERVICE_STATE_TTL has passed or the charm acted on
+        the service.
+        """
+        try:
+            return self._svc_state.get(self._query_service)
+        except (OSError, subprocess.CalledProcessError):
+            # The service is neither running nor failed as far as we can tell.
+            # This is not cached, so the next check asks systemd again.
+            return ServiceSnapshot(active_state="")
+
+    def _query_service(self) -> ServiceSnapshot:
+        """Asks systemd for the state of the service."""
+        output = subprocess.check_output(
+            [
+                "systemctl",
+                "show",
+                self.paths.svc_name,
+                "--property=ActiveState",
+            ],
+            text=True,
+        )
+        return ServiceSnapshot(active_state=output.strip().partition("=")[2])
 
     @override
     def start(self) -> bool:
         """Starts the workload service."""
-        return service_restart(self.paths.service)
+        try:
+            return service_restart(self.paths.service)
+        finally:
+            self._svc_state.clear()
 
     @override
     def restart(self) -> bool:
         """Restarts the benchmark service."""
-        return service_restart(self.paths.svc_name)
+        try:
+            return service_restart(self.paths.svc_name)
+        finally:
+            self._svc_state.clear()
 
     @override
     def halt(self) -> bool:
         """Stop the benchmark service."""
-        if self.is_active():
-            return service_stop(self.paths.svc_name)
-        return self.is_halted()
+        snapshot = self._service_snapshot()
+        if snapshot.running:
+            try:
+                return service_stop(self.paths.svc_name)
+            finally:
+                self._svc_state.clear()
+        return not snapshot.failed
 
     @override
     def reload(self) -> bool:
-        """Reloads the script."""
-        daemon_reload()
+        """Reloads the script.
+
+        daemon-reload is expensive, so it is skipped if systemd already has the latest unit file.
+        """
+        if not self._needs_daemon_reload():
+            return True
+        try:
+            return daemon_reload()
+        finally:
+            self._svc_state.clear()
+
+    def _needs_daemon_reload(self) -> bool:
+        """Checks if systemd must be reloaded to pick up the service file."""
+        try:
+            output = subprocess.check_output(
+                [
+                    "systemctl",
+                    "show",
+                    self.paths.svc_name,
+                    "--property=LoadState,NeedDaemonReload",
+                ],
+                text=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return True
+        props = dict(line.partition("=")[::2] for line in output.splitlines())
+        # A unit that was never loaded has nothing to reload, but systemd must still find it
+        return props.get("NeedDaemonReload") != "no" or props.get("LoadState") != "loaded"
 
     @override
     def read(self, path: str) -> list[str]:
@@ -123,9 +209,11 @@ class DPBenchmarkSystemdWorkloadBase(WorkloadBase):
             path: the full filepath to write to
             mode: the write mode. Usually "w" for write, or "a" for append. Default "w"
         """
+        # Only create the parent folder when we actually write to it
+        os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, mode) as f:
             f.write(content)
-            os.chmod(path, 0o640)
+            os.fchmod(f.fileno(), 0o640)
 
     @override
     def exec(
@@ -147,14 +235,15 @@ class DPBenchmarkSystemdWorkloadBase(WorkloadBase):
     @override
     def is_active(self) -> bool:
         """Checks that the workload is active."""
-        return service_running(self.paths.service)
+        return self._service_snapshot().running
 
     @override
     def _is_stopped(self) -> bool:
         """Checks that the workload is stopped."""
-        return not service_running(self.paths.service) and not service_failed(self.paths.service)
+        snapshot = self._service_snapshot()
+        return not (snapshot.running or snapshot.failed)
 
     @override
     def is_failed(self) -> bool:
         """Checks if the benchmark service has failed."""
-        return service_failed(self.paths.service)
+        return self._service_snapshot().failed
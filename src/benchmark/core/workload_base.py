@@ -101,6 +101,17 @@ class WorkloadBase(ABC):
         """
         ...
 
+    def read_text(self, path: str) -> str:
+        """Reads a file from the workload as a single string.
+
+        Args:
+            path: the full filepath to read from
+
+        Returns:
+            The lines of the file, joined by new lines
+        """
+        return "\n".join(self.read(path))
+
     @abstractmethod
     def write(self, content: str, path: str, mode: str = "w") -> None:
         """Writes content to a workload file.
@@ -102,7 +102,7 @@ class DatabaseRelationHandler(RelationHandler):
             if self.state.get():
                 self.on.db_config_update.emit()
         except DPBenchmarkMissingOptionsError as e:
-            logger.warning(f"Missing options: {e}")
+            logger.warning("Missing options: %s", e)
             pass
 
     @property
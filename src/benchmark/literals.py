@@ -54,17 +54,29 @@ class DPBenchmarkLifecycleState(str, Enum):
                  copied to the S3 endpoint
     * FINISHED: the service has finished
     * STOPPED: the service has been stopped by the user
+
+    Each state also carries its position in the lifecycle as `order`, so units can be
+    compared with each other without a separate lookup.
     """
 
-    UNSET = "unset"
-    PREPARING = "preparing"
-    AVAILABLE = "available"
-    RUNNING = "running"
-    FAILED = "failed"
-    COLLECTING = "collecting"
-    UPLOADING = "uploading"
-    FINISHED = "finished"
-    STOPPED = "stopped"
+    order: int
+
+    def __new__(cls, value: str, order: int):
+        """Create the state with its string value and its lifecycle order."""
+        obj = str.__new__(cls, value)
+        obj._value_ = value
+        obj.order = order
+        return obj
+
+    UNSET = "unset", 0
+    PREPARING = "preparing", 1
+    AVAILABLE = "available", 2
+    RUNNING = "running", 3
+    FAILED = "failed", 4
+    COLLECTING = "collecting", 5
+    UPLOADING = "uploading", 6
+    FINISHED = "finished", 7
+    STOPPED = "stopped", 8
 
 
 class DPBenchmarkLifecycleTransition(str, Enum):
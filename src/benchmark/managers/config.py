@@ -7,14 +7,25 @@ This class summarizes all the configuration needed for the workload execution
 and returns a model containing that information.
 """
 
+import functools
+import hashlib
 import logging
 import os
 import time
 from abc import abstractmethod
 from typing import Any, Optional
 
-from jinja2 import DictLoader, Environment, FileSystemLoader, exceptions
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    FunctionLoader,
+    Template,
+    exceptions,
+)
 
+from benchmark.core.cache import TTLCache
 from benchmark.core.models import (
     DPBenchmarkWrapperOptionsModel,
 )
@@ -26,6 +37,67 @@ from benchmark.literals import DPBenchmarkLifecycleTransition
 # Log messages can be retrieved using juju debug-log
 logger = logging.getLogger(__name__)
 
+# The rendered files may be removed outside of the charm, so we only trust a check for a while
+FILES_STATE_TTL = 1.0  # in seconds
+
+
+@functools.lru_cache(maxsize=8)
+def _get_env(templates_dir: str) -> Environment:
+    """Returns a shared jinja environment for the templates folder.
+
+    Templates are not changed during the charm execution, hence auto_reload is disabled.
+    """
+    return Environment(
+        loader=FileSystemLoader(templates_dir),
+        auto_reload=False,
+        cache_size=128,
+    )
+
+
+def _get_string_bytecode_cache() -> BytecodeCache | None:
+    """Returns the cache for the compiled code of the templates passed as strings.
+
+    Every hook runs in a new process, so the compiled code is kept on disk between hooks.
+    The cache is only used when running as a charm.
+    """
+    if not os.environ.get("CHARM_DIR"):
+        return None
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        # Not fatal: the templates are compiled in every hook instead
+        logger.debug("Failed to set up the templates bytecode cache: %s", e)
+        return None
+
+
+# Content of the templates passed as strings, indexed by their checksum
+_STRING_TEMPLATES: dict[str, str] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_string_env() -> Environment:
+    """Returns the shared environment for the templates that are passed as strings.
+
+    It is only built on the first render, together with its bytecode cache.
+    """
+    return Environment(
+        loader=FunctionLoader(_STRING_TEMPLATES.get),
+        auto_reload=False,
+        bytecode_cache=_get_string_bytecode_cache(),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_template_from_string(template_content: str) -> Template:
+    """Returns the compiled template for the given content.
+
+    The templates passed as strings are module constants, so we only compile them once.
+    They are loaded by name, hence their compiled code goes through the bytecode cache.
+    """
+    name = hashlib.sha1(template_content.encode()).hexdigest()
+    _STRING_TEMPLATES[name] = template_content
+    return _get_string_env().get_template(name)
+
 
 class ConfigManager:
     """Implements the config changes that happen on the workload."""
@@ -43,6 +115,10 @@ class ConfigManager:
         self.peer = peer
         self.database = database
         self.labels = labels
+        # Whether the rendered files exist, reset whenever _render writes a file
+        self._files_ready: TTLCache[bool] = TTLCache(FILES_STATE_TTL)
+        # Content of the rendered files, with the modification time and size it was read at
+        self._file_cache: dict[str, tuple[tuple[int, int], str]] = {}
 
     @abstractmethod
     def get_workload_params(self) -> dict[str, Any]:
@@ -118,7 +194,7 @@ class ConfigManager:
                 self.workload.paths.service,
             )
         except Exception as e:
-            logger.error(f"Failed to prepare the benchmark service: {e}")
+            logger.error("Failed to prepare the benchmark service: %s", e)
             return False
         return True
 
@@ -138,10 +214,12 @@ class ConfigManager:
                 DPBenchmarkLifecycleTransition.RUN,
                 self.workload.paths.service,
             )
+            # The workload decides if the service manager needs a reload: an earlier hook may
+            # have written the service file and failed before reloading it
             self.workload.reload()
             self.workload.restart()
         except Exception as e:
-            logger.error(f"Failed to run the benchmark service: {e}")
+            logger.error("Failed to run the benchmark service: %s", e)
             return False
         return True
 
@@ -158,7 +236,7 @@ class ConfigManager:
         try:
             return self.workload.halt()
         except Exception as e:
-            logger.error(f"Failed to stop the benchmark service: {e}")
+            logger.error("Failed to stop the benchmark service: %s", e)
             return False
 
     def is_stopped(
@@ -176,63 +254,107 @@ class ConfigManager:
     def _render_params(
         self,
         dst_path: str | None = None,
-    ) -> str | None:
+    ) -> str | bool:
         """Render the workload parameters."""
+        content = self._workload_params_content()
+        if not dst_path:
+            return content
+        return self._write_if_changed(content, dst_path)
+
+    def _workload_params_content(self) -> str:
+        """Returns the content of the workload parameters file."""
+        if not self.workload.workload_params_template:
+            # Nothing to render, the workload parameters file stays empty
+            return ""
         return self._render(
             values=self.get_workload_params(),
             template_file=None,
             template_content=self.workload.workload_params_template,
-            dst_filepath=dst_path,
         )
 
+    @functools.cached_property
+    def _execution_values(self) -> dict[str, Any] | None:
+        """Returns the execution options as the values used to render the service file.
+
+        The manager is created for each hook, so the options are only computed once per hook.
+        None is returned if the database is not ready yet.
+        """
+        if not (options := self.get_execution_options()):
+            return None
+        return options.dict() | {
+            "charm_root": os.environ.get("CHARM_DIR", ""),
+            "target_hosts": options.db_info.target_hosts,
+        }
+
+    def _service_values(
+        self,
+        transition: DPBenchmarkLifecycleTransition,
+    ) -> dict[str, Any]:
+        """Returns the values used to render the service file."""
+        return self._execution_values | {"command": transition.value}
+
     def _render_service(
         self,
         transition: DPBenchmarkLifecycleTransition,
         dst_path: str | None = None,
-    ) -> str | None:
+    ) -> str | bool:
         """Render the workload parameters."""
-        values = self.get_execution_options().dict() | {
-            "charm_root": os.environ.get("CHARM_DIR", ""),
-            "command": transition.value,
-        }
         return self._render(
-            values=values,
+            values=self._service_values(transition),
             template_file=self.workload.paths.service_template,
             template_content=None,
             dst_filepath=dst_path,
         )
 
+    def _files_exist(self) -> bool:
+        """Checks if the service and workload parameter files have been rendered.
+
+        A recent answer is trusted until _render writes to disk again.
+        """
+        return self._files_ready.get(self._stat_files)
+
+    def _stat_files(self) -> bool:
+        """Checks on disk if the service and workload parameter files exist."""
+        try:
+            os.stat(self.workload.paths.service)
+            os.stat(self.workload.paths.workload_params)
+        except OSError:
+            return False
+        return True
+
     def _check(
         self,
         transition: DPBenchmarkLifecycleTransition,
     ) -> bool:
-        if not (
-            os.path.exists(self.workload.paths.service)
-            and os.path.exists(self.workload.paths.workload_params)
-            and (values := self.get_execution_options())
-        ):
+        if not (self._files_exist() and self._execution_values):
             return False
-        values = values.dict() | {
-            "charm_root": os.environ.get("CHARM_DIR", ""),
-            "command": transition.value,
-            "target_hosts": values.db_info.hosts,
-        }
-        compare_svc = "\n".join(self.workload.read(self.workload.paths.service)) == self._render(
-            values=values,
-            template_file=self.workload.paths.service_template,
+        paths = self.workload.paths
+        service = self._render(
+            values=self._service_values(transition),
+            template_file=paths.service_template,
             template_content=None,
             dst_filepath=None,
         )
-        compare_params = "\n".join(
-            self.workload.read(self.workload.paths.workload_params)
-        ) == self._render(
-            values=self.get_workload_params(),
-            template_file=None,
-            template_content=self.workload.workload_params_template,
-            dst_filepath=None,
-        )
+        if self._read_rendered(paths.service) != service:
+            # No need to render the workload parameters, the check has already failed
+            return False
+        return self._read_rendered(paths.workload_params) == self._workload_params_content()
+
+    def _read_rendered(self, path: str) -> str:
+        """Reads a rendered file.
 
-        return compare_svc and compare_params
+        Its content is reused as long as the file keeps the same modification time and size.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self.workload.read_text(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if (cached := self._file_cache.get(path)) and cached[0] == version:
+            return cached[1]
+        content = self.workload.read_text(path)
+        self._file_cache[path] = (version, content)
+        return content
 
     def _render(
         self,
@@ -240,20 +362,47 @@ class ConfigManager:
         template_file: str | None,
         template_content: str | None,
         dst_filepath: str | None = None,
-    ) -> str:
-        """Renders from a file or an string content and return final rendered value."""
+    ) -> str | bool:
+        """Renders from a file or an string content and return final rendered value.
+
+        If dst_filepath is set, the content is written there instead and we return
+        whether the file has changed.
+        """
         try:
             if template_file:
-                template_env = Environment(loader=FileSystemLoader(self.workload.paths.templates))
+                template_env = _get_env(self.workload.paths.templates)
                 template = template_env.get_template(template_file)
             else:
-                template_env = Environment(
-                    loader=DictLoader({"workload_params": template_content})
-                )
-                template = template_env.get_template("workload_params")
+                template = _get_template_from_string(template_content)
             content = template.render(values)
         except exceptions.TemplateNotFound as e:
             raise e
         if not dst_filepath:
             return content
-        self.workload.write(content, dst_filepath)
+        return self._write_if_changed(content, dst_filepath)
+
+    def _write_if_changed(self, content: str, dst_filepath: str) -> bool:
+        """Writes content to dst_filepath and returns whether the file has changed."""
+        if self._is_unchanged(content, dst_filepath):
+            return False
+        try:
+            self.workload.write(content, dst_filepath)
+        finally:
+            self._files_ready.clear()
+            self._file_cache.pop(dst_filepath, None)
+        return True
+
+    def _is_unchanged(self, content: str, path: str) -> bool:
+        """Checks if the file in path already holds the given content.
+
+        The file size is compared first, so we only read files that may match.
+        """
+        data = content.encode()
+        try:
+            if os.stat(path).st_size != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except OSError:
+            # Missing or unreadable, either way we (re)write the file
+            return False
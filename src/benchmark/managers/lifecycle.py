@@ -3,6 +3,9 @@
 
 """The lifecycle manager class."""
 
+from operator import attrgetter
+from typing import Callable
+
 from ops.model import (
     ActiveStatus,
     BlockedStatus,
@@ -25,6 +28,14 @@ class LifecycleManager:
     def __init__(self, peers: PeerRelationHandler, config_manager: ConfigManager):
         self.peers = peers
         self.config_manager = config_manager
+        self._transitions: dict[DPBenchmarkLifecycleState, Callable[[], bool]] = {
+            DPBenchmarkLifecycleState.UNSET: self._to_unset,
+            DPBenchmarkLifecycleState.AVAILABLE: self._to_stopped,
+            DPBenchmarkLifecycleState.RUNNING: self._to_running,
+            DPBenchmarkLifecycleState.FAILED: self._to_failed,
+            DPBenchmarkLifecycleState.FINISHED: self._to_stopped,
+            DPBenchmarkLifecycleState.STOPPED: self._to_stopped,
+        }
 
     def current(self) -> DPBenchmarkLifecycleState:
         """Return the current lifecycle state."""
@@ -33,70 +44,55 @@ class LifecycleManager:
             or DPBenchmarkLifecycleState.UNSET
         )
 
-    def make_transition(self, new_state: DPBenchmarkLifecycleState) -> bool:  # noqa: C901
+    def make_transition(self, new_state: DPBenchmarkLifecycleState) -> bool:
         """Update the lifecycle state.
 
-        The main task is to do the update status. The first batch of if statements are
-        checks if we cannot do so. In any of these ifs, we return False.
+        The main task is to do the update status. First, we run the handler for the new state,
+        if there is one. If the handler cannot bring the workload to the new state, we return
+        False.
 
         Once these steps are done, we update the status and return True.
         """
-        if new_state == DPBenchmarkLifecycleState.UNSET:
-            # We stop any service right away
-            if not self.config_manager.is_stopped() and not self.config_manager.stop():
-                return False
-            # And clean up the workload
-            if not self.config_manager.is_cleaned() and not self.config_manager.clean():
-                return False
-
-        # The transition "PREPARING" is a special case:
-        # Only one unit executes it and the others way.
-        # Therefore, the PREPARING state must be processed at "PREPARE" call
-        # if new_state == DPBenchmarkLifecycleState.PREPARING:
-        #     # Prepare the workload
-        #     if not self.config_manager.prepare():
-        #         return False
-
-        if new_state == DPBenchmarkLifecycleState.AVAILABLE:
-            # workload should be prepared, check we are stopped or stop it
-            if not self.config_manager.is_stopped() and not self.config_manager.stop():
-                return False
-
-        if new_state == DPBenchmarkLifecycleState.RUNNING:
-            # Start the workload
-            if not self.config_manager.is_running() and not self.config_manager.run():
-                return False
-
-        # TODO: Implement the following states
-        # if new_state == DPBenchmarkLifecycleState.COLLECTING:
-        #     # Collect the workload data
-        #     if not self.config_manager.is_collecting() or not self.config_manager.collect():
-        #         return False
-        # if new_state == DPBenchmarkLifecycleState.UPLOADING:
-        #     # Collect the workload data
-        #     if not self.config_manager.is_uploading() or not self.config_manager.upload():
-        #         return False
-
-        if new_state == DPBenchmarkLifecycleState.FAILED:
-            # Stop the workload
-            if (
-                not self.config_manager.is_failed()
-                and not self.config_manager.is_stopped()
-                and not self.config_manager.stop()
-            ):
-                return False
-
-        if new_state in [
-            DPBenchmarkLifecycleState.FINISHED,
-            DPBenchmarkLifecycleState.STOPPED,
-        ]:
-            # Stop the workload
-            if not self.config_manager.is_stopped() and not self.config_manager.stop():
-                return False
+        if (handler := self._transitions.get(new_state)) and not handler():
+            return False
 
         self.peers.unit_state(self.peers.this_unit()).lifecycle = new_state.value
         return True
 
+    def _to_unset(self) -> bool:
+        # We stop any service right away
+        if not self._to_stopped():
+            return False
+        # And clean up the workload
+        return self.config_manager.is_cleaned() or self.config_manager.clean()
+
+    # The transition "PREPARING" is a special case:
+    # Only one unit executes it and the others way.
+    # Therefore, the PREPARING state must be processed at "PREPARE" call
+    # and it has no entry in self._transitions.
+
+    def _to_running(self) -> bool:
+        # Start the workload
+        return self.config_manager.is_running() or self.config_manager.run()
+
+    # TODO: Implement the following states
+    # COLLECTING:
+    #     # Collect the workload data
+    #     if not self.config_manager.is_collecting() or not self.config_manager.collect():
+    #         return False
+    # UPLOADING:
+    #     # Collect the workload data
+    #     if not self.config_manager.is_uploading() or not self.config_manager.upload():
+    #         return False
+
+    def _to_failed(self) -> bool:
+        # Stop the workload
+        return self.config_manager.is_failed() or self._to_stopped()
+
+    def _to_stopped(self) -> bool:
+        # Check we are stopped or stop it
+        return self.config_manager.is_stopped() or self.config_manager.stop()
+
     def next(  # noqa: C901
         self, transition: DPBenchmarkLifecycleTransition | None = None
     ) -> DPBenchmarkLifecycleState | None:
@@ -220,14 +216,16 @@ class LifecycleManager:
         return None
 
     def _peers_state(self) -> DPBenchmarkLifecycleState | None:
-        next_state = self.peers.unit_state(self.peers.this_unit()).lifecycle
-        for unit in self.peers.units():
-            neighbor = self.peers.unit_state(unit).lifecycle
-            if neighbor is None:
-                continue
-            elif self._compare_lifecycle_states(neighbor, next_state) > 0:
-                next_state = neighbor
-        return next_state or DPBenchmarkLifecycleState.UNSET
+        this_state = (
+            self.peers.unit_state(self.peers.this_unit()).lifecycle
+            or DPBenchmarkLifecycleState.UNSET
+        )
+        neighbors = (self.peers.unit_state(unit).lifecycle for unit in self.peers.units())
+        # max() keeps the first of equal states, so this unit wins any tie
+        return max(
+            (this_state, *(state for state in neighbors if state is not None)),
+            key=attrgetter("order"),
+        )
 
     @property
     def status(self) -> StatusBase:
@@ -259,7 +257,7 @@ class LifecycleManager:
         # if self.current() == DPBenchmarkLifecycleState.STOPPED:
         return WaitingStatus("Benchmark is stopped")
 
-    def _compare_lifecycle_states(  # noqa: C901
+    def _compare_lifecycle_states(
         self, neighbor: DPBenchmarkLifecycleState, this: DPBenchmarkLifecycleState
     ) -> int:
         """Compare the lifecycle, if the unit A is more advanced than unit B or vice-versa.
@@ -267,27 +265,4 @@ class LifecycleManager:
         neighbor - this: if values return greater than 0, then return greatest neighbor state
         else: return None (no changes should be considered)
         """
-        if neighbor == this:
-            return 0
-
-        def _get_value(phase: DPBenchmarkLifecycleState) -> int:  # noqa: C901
-            if phase == DPBenchmarkLifecycleState.UNSET:
-                return 0
-            if phase == DPBenchmarkLifecycleState.PREPARING:
-                return 1
-            if phase == DPBenchmarkLifecycleState.AVAILABLE:
-                return 2
-            if phase == DPBenchmarkLifecycleState.RUNNING:
-                return 3
-            if phase == DPBenchmarkLifecycleState.FAILED:
-                return 4
-            if phase == DPBenchmarkLifecycleState.COLLECTING:
-                return 5
-            if phase == DPBenchmarkLifecycleState.UPLOADING:
-                return 6
-            if phase == DPBenchmarkLifecycleState.FINISHED:
-                return 7
-            if phase == DPBenchmarkLifecycleState.STOPPED:
-                return 8
-
-        return _get_value(neighbor) - _get_value(this)
+        return neighbor.order - this.order
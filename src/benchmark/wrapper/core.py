@@ -3,10 +3,11 @@
 
 """The core models for the wrapper script."""
 
+import shlex
 from enum import Enum
 
 from prometheus_client import Gauge
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 
 class BenchmarkCommand(str, Enum):
@@ -33,12 +34,30 @@ class ProcessModel(BaseModel):
     """Model to hold the process information."""
 
     cmd: str
+    # The command split into its arguments, so it can be executed without a shell
+    argv: list[str] = []
     pid: int = -1
     status: str = ProcessStatus.TO_START
     user: str | None = None
     group: str | None = None
     cwd: str | None = None
 
+    class Config:
+        """Model configuration.
+
+        The pid and status are updated as the process runs, so the model is not frozen.
+        """
+
+        extra = "forbid"
+
+    @validator("argv", always=True)
+    @classmethod
+    def split_cmd(cls, argv, values):
+        """Split the command into argv if it was not explicitly set."""
+        if argv or "cmd" not in values:
+            return argv
+        return shlex.split(values["cmd"])
+
 
 class MetricOptionsModel(BaseModel):
     """Model to hold the metrics."""
@@ -47,6 +66,12 @@ class MetricOptionsModel(BaseModel):
     extra_labels: list[str] = []
     description: str | None = None
 
+    class Config:
+        """Model configuration."""
+
+        frozen = True
+        extra = "forbid"
+
 
 class WorkloadCLIArgsModel(BaseModel):
     """Model to hold the workload options."""
@@ -62,6 +87,12 @@ class WorkloadCLIArgsModel(BaseModel):
     extra_labels: str
     peers: str
 
+    class Config:
+        """Model configuration."""
+
+        frozen = True
+        extra = "forbid"
+
 
 class BenchmarkMetrics:
     """Class to hold the benchmark metrics."""
@@ -72,16 +103,38 @@ class BenchmarkMetrics:
     ):
         self.options = options
         self.metrics = {}
+        # The labelled child of each gauge, indexed by the sample key.
+        # The labels never change, so we resolve them only once per gauge.
+        self._samples = {}
+        # Latest values added since the last flush, indexed by the sample key
+        self._pending: dict[str, float] = {}
 
     def add(self, sample: BaseModel):
-        """Add the benchmark to the prometheus metric."""
-        for key, value in sample.dict().items():
-            if f"{self.options.label}_{key}" not in self.metrics:
-                self.metrics[f"{self.options.label}_{key}"] = Gauge(
-                    f"{self.options.label}_{key}",
+        """Add the benchmark sample to the metrics.
+
+        The values are only published to prometheus on the next flush().
+        """
+        self._pending.update(sample.dict())
+
+    def add_many(self, samples: list[BaseModel]):
+        """Add several benchmark samples at once.
+
+        Like add(), the values are only published to prometheus on the next flush().
+        """
+        pending = self._pending
+        for sample in samples:
+            pending.update(sample.dict())
+
+    def flush(self):
+        """Publish the latest value of each metric to prometheus."""
+        pending, self._pending = self._pending, {}
+        for key, value in pending.items():
+            if (gauge := self._samples.get(key)) is None:
+                name = f"{self.options.label}_{key}"
+                self.metrics[name] = Gauge(
+                    name,
                     f"{self.options.description} {key}",
                     ["model", "unit"],
                 )
-            self.metrics[f"{self.options.label}_{key}"].labels(*self.options.extra_labels).set(
-                value
-            )
+                gauge = self._samples[key] = self.metrics[name].labels(*self.options.extra_labels)
+            gauge.set(value)
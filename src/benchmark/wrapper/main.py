@@ -30,9 +30,7 @@ class MainWrapper:
         signal.signal(signal.SIGTERM, _exit)
         start_http_server(8088)
 
-        # Start the manager and process the output
-        manager.start()
-        # Now, start the event loop to monitor the processes:
+        # Start the event loop, which starts the processes and monitors their output
         manager.run()
 
 
@@ -65,5 +63,6 @@ class MainWrapper:
 #     # Parse the arguments as dictionary, using the same logic as:
 #     # https://github.com/python/cpython/blob/ \
 #     #     47c5a0f307cff3ed477528536e8de095c0752efa/Lib/argparse.py#L134
-#     args = parser.parse_args().__dict__ | {"command": BenchmarkCommand(parser.parse_args().command)}
+#     args = vars(parser.parse_args())
+#     args["command"] = BenchmarkCommand(args["command"])
 #     MainWrapper(WorkloadCLIArgsModel.parse_obj(args)).run()
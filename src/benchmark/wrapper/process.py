@@ -8,11 +8,14 @@ same task or running different tasks at once.
 """
 
 import asyncio
+import codecs
 import logging
+import math
 import os
-import subprocess
+import signal
 import time
 from abc import ABC, abstractmethod
+from typing import Callable
 
 from core import (
     BenchmarkCommand,
@@ -25,6 +28,9 @@ from pydantic import BaseModel
 
 VALID_LOG_LEVELS = ["info", "debug", "warning", "error", "critical"]
 
+# Size of each read from the process output
+READ_CHUNK_SIZE = 64 * 1024
+
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -41,8 +47,13 @@ class BenchmarkProcess(ABC):
     is to represent both cases where a given process output is relevant and contains
     metrics that need to be uploaded to Prometheus OR when the output is just a log
     line to keep track of the information.
+
+    The attributes are declared in `__slots__`, as there is one instance per worker.
+    Subclasses should declare their own `__slots__`, even if empty, to keep it that way.
     """
 
+    __slots__ = ("model", "metrics", "args", "_proc")
+
     def __init__(
         self,
         model: ProcessModel,
@@ -54,85 +65,152 @@ class BenchmarkProcess(ABC):
         self.args = args
         self._proc = None
 
-    def start(self):
-        """Start the process."""
-        self._proc = subprocess.Popen(
-            self.model.cmd,
+    async def start(self):
+        """Start the process.
+
+        The process is bound to the running event loop, which will also consume its output.
+        It is executed without a shell and in its own session, so stop() can kill its entire
+        process group.
+        """
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.model.argv,
             user=self.model.user,
             group=self.model.group,
             stdin=None,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            shell=True,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=self.model.cwd,
+            start_new_session=True,
         )
-        # Now, let's make stdout a non-blocking file
-        os.set_blocking(self._proc.stdout.fileno(), False)
 
         self.model.pid = self._proc.pid
         self.model.status = ProcessStatus.RUNNING
 
     def status(self) -> ProcessStatus:
         """Return the status of the process."""
+        if self.model.status is ProcessStatus.STOPPED or self.model.status is ProcessStatus.ERROR:
+            # The process has already finished, its status will not change anymore
+            return self.model.status
         stat = ProcessStatus.STOPPED
-        if self._proc.poll() is None:
+        if self._proc.returncode is None:
             stat = ProcessStatus.RUNNING
         elif self._proc.returncode != 0:
             stat = ProcessStatus.ERROR
         self.model.status = stat
         return stat
 
-    async def process(
+    async def run_loop(
         self,
         auto_stop: bool = True,
     ):
         """Run one step of the main benchmark service loop."""
-        initial_time = int(time.time())
-        finish_time = initial_time + self.args.duration
+        # The arguments do not change while we run, read them only once
+        duration = self.args.duration
+        max_run_count = self.args.run_count
+        # Monotonic time is not affected by changes to the system clock
+        deadline = time.monotonic() + duration if duration else math.inf
 
         run_count = 0
-        while (
-            (run_count < self.args.run_count and self.args.run_count != 0)
-            or (int(time.time()) >= finish_time and self.args.duration != 0)
-            or (self.status() == ProcessStatus.RUNNING and self.args.duration == 0)
-        ):
-            to_wait = True
-            for line in iter(self._proc.stdout.readline, ""):
-                if output := self.process_line(line):
-                    self.metrics.add(output)
-
-                    if self.status() != ProcessStatus.RUNNING:
-                        # Process has finished
-                        break
-
-                    to_wait = False
-
-                # Log the output.
-                # This way, an user can see what the process is doing and
-                # some of the metrics will be readily available without COS.
-                logger.info(f"[workload pid {self._proc.pid}] " + line.rstrip())
-
-            if to_wait:
-                # In case the stdout is empty, we ensure we sleep anyways
-                await asyncio.sleep(self.args.report_interval)
-
-            # If we are considering the
-            if self.status() != ProcessStatus.RUNNING and self.args.run_count:
-                # Increase the run count
+        while run_count < max_run_count or time.monotonic() < deadline:
+            if self._proc.stdout.at_eof():
+                # The process has exited and its output is closed: there is nothing left to wait
+                # for, so we stop here instead of sleeping until the conditions above change.
+                # The exit code may not be known yet, wait for it so the status is accurate.
+                await self._proc.wait()
+                break
+
+            # The duration bounds the whole loop, even if there are runs left to complete
+            if not await self._read_output(deadline):
+                # The duration is over and the process is still running
+                break
+
+            # The output is closed, wait for the process to report its exit code
+            await self._proc.wait()
+
+            # The process has finished at this point, so it counts as a run
+            if max_run_count:
                 run_count += 1
 
         # Now we are finished, check if we need to stop the process
-        if auto_stop and self.status() == ProcessStatus.RUNNING:
+        if auto_stop and self.status() is ProcessStatus.RUNNING:
             self.stop()
+            # Reap the killed process, so it does not linger as a zombie
+            await self._proc.wait()
+
+    async def _read_output(self, deadline: float) -> bool:
+        """Read the process output until it is closed.
+
+        Returns False if the deadline was reached before the output was closed.
+        """
+        stdout = self._proc.stdout
+        handle_lines = self._line_handler()
+
+        # Wait for the output in the event loop, so all the processes are read concurrently.
+        # We read it in large chunks and split the lines ourselves, keeping any incomplete
+        # line until the next chunk arrives. Each chunk is decoded at once, the decoder keeps
+        # any character split between two chunks.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial_line = ""
+        try:
+            while chunk := await asyncio.wait_for(
+                stdout.read(READ_CHUNK_SIZE),
+                None if deadline == math.inf else max(deadline - time.monotonic(), 0),
+            ):
+                *lines, partial_line = (partial_line + decoder.decode(chunk)).split("\n")
+                handle_lines(lines)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if partial_line := partial_line + decoder.decode(b"", final=True):
+                # The output ended without a trailing new line
+                handle_lines([partial_line], newline="")
+        return True
+
+    def _line_handler(self) -> Callable[..., None]:
+        """Returns the function that processes and logs the lines of the process output.
+
+        What is used for every output line is bound once, instead of looking it up on each line.
+        """
+        process_line = self.process_line
+        add_metrics = self.metrics.add_many
+        log_prefix = f"[workload pid {self._proc.pid}] "
+
+        def handle_lines(lines: list[str], newline: str = "\n"):
+            samples = []
+            # Log the output.
+            # This way, an user can see what the process is doing and
+            # some of the metrics will be readily available without COS.
+            # The lines are only kept if they will be logged, and go out as a single record.
+            log_lines = [] if logger.isEnabledFor(logging.INFO) else None
+            for line in lines:
+                line += newline
+                # The read loop ends once the process closes its output, so there is
+                # no need to check the process status for every line
+                if output := process_line(line):
+                    samples.append(output)
+                if log_lines is not None:
+                    log_lines.append(log_prefix + line.rstrip())
+            if log_lines:
+                logger.info("%s", "\n".join(log_lines))
+            # Hand over all the samples of this chunk at once
+            if samples:
+                add_metrics(samples)
+
+        return handle_lines
 
     def stop(self):
-        """Stop the process."""
+        """Stop the process.
+
+        A process that has already finished keeps its status, so an ERROR is not lost.
+        """
+        was_running = self._proc is not None and self.status() is ProcessStatus.RUNNING
         try:
-            self._proc.kill()
+            # The process leads its own session, so its pid is also its process group id
+            os.killpg(self._proc.pid, signal.SIGKILL)
         except Exception as e:
-            logger.warning(f"Error stopping worker: {e}")
-        self.model.status = ProcessStatus.STOPPED
+            logger.warning("Error stopping worker: %s", e)
+        if was_running:
+            self.model.status = ProcessStatus.STOPPED
 
     @abstractmethod
     def process_line(self, line: str) -> BaseModel | None:
@@ -143,6 +221,8 @@ class BenchmarkProcess(ABC):
 class BenchmarkManager(BenchmarkProcess):
     """This class is in charge of managing all the processes in the benchmark run."""
 
+    __slots__ = ("workers",)
+
     def __init__(
         self,
         model: ProcessModel | None,
@@ -156,27 +236,60 @@ class BenchmarkManager(BenchmarkProcess):
     async def _exec(self, auto_stop: bool = True):
         tasks = []
         for worker in self.workers:
-            tasks.append(asyncio.create_task(worker.process(auto_stop=auto_stop)))
-        tasks.append(asyncio.create_task(self.process(auto_stop=auto_stop)))
-        await asyncio.gather(*tasks)
+            tasks.append(asyncio.create_task(worker.run_loop(auto_stop=auto_stop)))
+        tasks.append(asyncio.create_task(self.run_loop(auto_stop=auto_stop)))
+        flush_task = asyncio.create_task(self._flush_metrics())
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # One of the loops failed or we were cancelled: do not leave the other loops
+            # running nor their processes orphaned
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.stop()
+            raise
+        finally:
+            flush_task.cancel()
+            # Let the task finish its cancellation before the last flush
+            await asyncio.gather(flush_task, return_exceptions=True)
+            # Publish whatever was collected since the last report
+            self.metrics.flush()
+
+    async def _flush_metrics(self):
+        """Publish the collected metrics once every report interval."""
+        report_interval = self.args.report_interval
+        if report_interval <= 0:
+            # Sleeping for 0s would keep this loop busy for the whole run
+            logger.error(
+                "Invalid report interval %s, metrics are only published at the end",
+                report_interval,
+            )
+            return
+        while True:
+            await asyncio.sleep(report_interval)
+            self.metrics.flush()
+
+    async def _run(self):
+        await self.start()
+        await self._exec()
 
     def run(self):
-        """Run all the workers in the async loop."""
-        asyncio.run(self._exec())
+        """Start all the processes and run them in the async loop."""
+        asyncio.run(self._run())
 
     def all_running(self) -> bool:
         """Check if all the workers are running."""
-        return (
-            all(w.status() == ProcessStatus.RUNNING for w in self.workers)
-            and self.status() == ProcessStatus.RUNNING
+        return self.status() is ProcessStatus.RUNNING and all(
+            w.status() is ProcessStatus.RUNNING for w in self.workers
         )
 
-    def start(self):
+    async def start(self):
         """Start the benchmark tool."""
         if self.model:
-            super().start()
-        for worker in self.workers:
-            worker.start()
+            await super().start()
+        # Spawn all the workers concurrently
+        await asyncio.gather(*(worker.start() for worker in self.workers))
 
     def stop(self):
         """Stop the benchmark tool."""
@@ -205,13 +318,13 @@ class WorkloadToProcessMapping(ABC):
 
         The processes will not be started.
         """
-        if cmd == BenchmarkCommand.PREPARE:
+        if cmd is BenchmarkCommand.PREPARE:
             self.manager, procs = self._map_prepare()
             return self.manager, procs
-        elif cmd == BenchmarkCommand.RUN:
+        elif cmd is BenchmarkCommand.RUN:
             self.manager, procs = self._map_run()
             return self.manager, procs
-        elif cmd == BenchmarkCommand.CLEANUP:
+        elif cmd is BenchmarkCommand.CLEANUP:
             self.manager, procs = self._map_clean()
             return self.manager, procs
         raise ValueError(f"Invalid command: {cmd}")
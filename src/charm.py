@@ -18,18 +18,17 @@ the user.
 import logging
 import os
 from functools import cached_property
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Sequence
 
-import charms.operator_libs_linux.v0.apt as apt
 import ops
 from charms.data_platform_libs.v0.data_interfaces import KafkaRequires
-from charms.kafka.v0.client import KafkaClient, NewTopic
 from ops.charm import CharmBase
 from ops.framework import EventBase
 from ops.model import Application, BlockedStatus, Relation, Unit
 from overrides import override
 
 from benchmark.base_charm import DPBenchmarkCharmBase
+from benchmark.core.cache import TTLCache
 from benchmark.core.models import (
     DatabaseState,
     DPBenchmarkBaseDatabaseModel,
@@ -44,7 +43,12 @@ from benchmark.literals import (
 )
 from benchmark.managers.config import ConfigManager
 from benchmark.managers.lifecycle import LifecycleManager
-from literals import CLIENT_RELATION_NAME, TOPIC_NAME
+from literals import CLIENT_RELATION_NAME, SUPPORTED_WORKLOADS, TOPIC_NAME
+
+if TYPE_CHECKING:
+    # The Kafka client and apt are only needed by a few hooks and are imported there,
+    # so the other hooks do not pay for loading them
+    from charms.kafka.v0.client import KafkaClient
 
 # Log messages can be retrieved using juju debug-log
 logger = logging.getLogger(__name__)
@@ -92,6 +96,8 @@ consumerBacklogSizeGB: 0
 testDurationMinutes: {{ duration }}
 """
 
+# The service file only substitutes values, so it is rendered with str.format_map instead
+# of jinja. There is no trailing new line, as jinja would have dropped it.
 KAFKA_SYSTEMD_SERVICE_TEMPLATE = """[Unit]
 Description=Service for controlling kafka openmessaging benchmark
 Wants=network.target
@@ -99,16 +105,33 @@ Requires=network.target
 
 [Service]
 EnvironmentFile=-/etc/environment
-Environment=PYTHONPATH={{ charm_root }}/lib:{{ charm_root }}/venv:{{ charm_root }}/src/benchmark/wrapper
-ExecStart={{ charm_root }}/src/wrapper.py --test_name={{ test_name }} --command={{ command }} --workload={{ workload_name }} --threads={{ threads }} --parallel_processes={{ parallel_processes }} --duration={{ duration }} --peers={{ peers }} --extra_labels={{ labels }} {{ extra_config }}
+Environment=PYTHONPATH={charm_root}/lib:{charm_root}/venv:{charm_root}/src/benchmark/wrapper
+ExecStart={charm_root}/src/wrapper.py --test_name={test_name} --command={command} --workload={workload_name} --threads={threads} --parallel_processes={parallel_processes} --duration={duration} --peers={peers} --extra_labels={labels} {extra_config}
 Restart=no
 TimeoutSec=600
-Type=simple
-"""
+Type=simple"""
 
 WORKER_PARAMS_YAML_FILE = "worker_params.yaml"
 TEN_YEARS_IN_MINUTES = 5_256_000
 
+# Listing the topics is a round-trip to the cluster, so we reuse the answer for a short while
+TOPICS_TTL = 1.0  # in seconds
+
+
+class _ServiceValues(dict):
+    """Values of the service file, where the missing ones render as empty strings."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+class _KafkaConfig(NamedTuple):
+    """Snapshot of the charm options used by the Kafka config manager."""
+
+    threads: int
+    parallel_processes: int
+    duration: int
+
 
 class KafkaDatabaseState(DatabaseState):
     """State collection for the database relation."""
@@ -122,14 +145,18 @@ class KafkaDatabaseState(DatabaseState):
             data=data,
         )
         self.database_key = "topic"
+        # The state is built from a snapshot of the relation data, so the model never changes
+        self._model: DPBenchmarkBaseDatabaseModel | None = None
 
     def get(self) -> DPBenchmarkBaseDatabaseModel | None:
         """Returns the value of the key."""
+        if self._model:
+            return self._model
         if not self.relation or not (endpoints := self.remote_data.get("endpoints")):
             return None
 
         dbmodel = super().get()
-        return DPBenchmarkBaseDatabaseModel(
+        self._model = DPBenchmarkBaseDatabaseModel(
             hosts=endpoints.split(","),
             unix_socket=dbmodel.unix_socket,
             username=dbmodel.username,
@@ -138,6 +165,7 @@ class KafkaDatabaseState(DatabaseState):
             tls=self.tls,
             tls_ca=self.tls_ca,
         )
+        return self._model
 
 
 class KafkaDatabaseRelationHandler(DatabaseRelationHandler):
@@ -165,14 +193,27 @@ class KafkaDatabaseRelationHandler(DatabaseRelationHandler):
             extra_user_roles="admin",
             consumer_group_prefix=self.consumer_prefix,
         )
+        # The relation data does not change while a hook runs, so we fetch it only once
+        self._state_cache: KafkaDatabaseState | None = None
+        self.framework.observe(self.framework.on.commit, self._on_commit)
+
+    def _on_commit(self, _: EventBase) -> None:
+        """Drops the cached state at the end of the hook."""
+        self._state_cache = None
+        self.__dict__.pop("hosts", None)
 
     @property
     @override
     def state(self) -> RelationState:
         """Returns the state of the database."""
-        if not (
-            self.relation and self.client and self.relation.id in self.client.fetch_relation_data()
-        ):
+        if self._state_cache is None:
+            self._state_cache = self._fetch_state()
+        return self._state_cache
+
+    def _fetch_state(self) -> KafkaDatabaseState:
+        """Builds the state of the database with a single read of the relation data."""
+        relation_data = (self.relation and self.client and self.client.fetch_relation_data()) or {}
+        if not self.relation or self.relation.id not in relation_data:
             logger.error("Relation data not found")
             # We may have an error if the relation is gone but self.relation.id still exists
             # or if the relation is not found in the fetch_relation_data yet
@@ -183,7 +224,7 @@ class KafkaDatabaseRelationHandler(DatabaseRelationHandler):
         return KafkaDatabaseState(
             self.charm.app,
             self.relation,
-            data=self.client.fetch_relation_data()[self.relation.id],
+            data=relation_data[self.relation.id],
         )
 
     @property
@@ -192,9 +233,14 @@ class KafkaDatabaseRelationHandler(DatabaseRelationHandler):
         """Returns the data_interfaces client corresponding to the database."""
         return self._internal_client
 
+    @cached_property
+    def hosts(self) -> list[str]:
+        """The hosts of the database, kept until the end of the hook."""
+        return self.state.get().hosts
+
     def bootstrap_servers(self) -> str | None:
         """Return the bootstrap servers."""
-        return self.state.get().hosts
+        return self.hosts
 
     def tls(self) -> tuple[str, str] | None:
         """Return the TLS certificates."""
@@ -206,14 +252,40 @@ class KafkaDatabaseRelationHandler(DatabaseRelationHandler):
 class KafkaPeersRelationHandler(PeerRelationHandler):
     """Listens to all the peer-related events and react to them."""
 
+    def __init__(self, charm, relation_name):
+        super().__init__(charm, relation_name)
+        # The units and process count used to compute the peers, and the peers themselves
+        self._peers_cache: tuple[tuple[tuple[Unit, ...], int], list[str]] | None = None
+
+    @override
+    def _on_peer_changed(self, event: EventBase) -> None:
+        """Handle the relation-changed event."""
+        # The addresses of the units may have changed
+        self._peers_cache = None
+        super()._on_peer_changed(event)
+
     @override
     def peers(self) -> list[str]:
-        """Return the peers."""
-        return [
-            f"{self.relation.data[u]['ingress-address']}:{8080 + 2 * port}"
-            for u in list(self.units()) + [self.this_unit()]
-            for port in range(0, self.charm.config.get("parallel_processes"))
+        """Return the peers.
+
+        The list is kept until the units or the number of processes change.
+        """
+        units = (*self.units(), self.this_unit())
+        parallel_processes = self.charm.config.get("parallel_processes")
+        key = (units, parallel_processes)
+        if self._peers_cache and self._peers_cache[0] == key:
+            return list(self._peers_cache[1])
+
+        # The ports are the same for every unit, compute them only once
+        ports = range(8080, 8080 + 2 * parallel_processes, 2)
+        relation_data = self.relation.data
+        peers = [
+            f"{address}:{port}"
+            for address in (relation_data[u]["ingress-address"] for u in units)
+            for port in ports
         ]
+        self._peers_cache = (key, peers)
+        return list(peers)
 
 
 class KafkaConfigManager(ConfigManager):
@@ -227,30 +299,33 @@ class KafkaConfigManager(ConfigManager):
         config: dict[str, Any],
         labels: Optional[str] = "",
     ):
-        self.workload = workload
+        super().__init__(workload, database, peer, config, labels)
         self.workload.worker_params_template = KAFKA_WORKER_PARAMS_TEMPLATE
-
-        self.config = config
-        self.peer = peer
-        self.database = database
-        self.labels = labels
+        # The options do not change during a hook, read them only once
+        self._cfg = _KafkaConfig(
+            threads=config.get("threads"),
+            parallel_processes=config.get("parallel_processes"),
+            duration=config.get("duration"),
+        )
+        # Topics in the cluster, reset whenever we create or delete one
+        self._topics_cache: TTLCache[set[str]] = TTLCache(TOPICS_TTL)
 
     @override
     def _render_service(
         self,
         transition: DPBenchmarkLifecycleTransition,
         dst_path: str | None = None,
-    ) -> str | None:
+    ) -> str | bool:
         """Render the workload parameters."""
-        values = self.get_execution_options().dict() | {
-            "charm_root": os.environ.get("CHARM_DIR", ""),
-            "command": transition.value,
-        }
-        return self._render(
-            values=values,
-            template_file=None,
-            template_content=KAFKA_SYSTEMD_SERVICE_TEMPLATE,
-            dst_filepath=dst_path,
+        content = self._service_content(transition)
+        if not dst_path:
+            return content
+        return self._write_if_changed(content, dst_path)
+
+    def _service_content(self, transition: DPBenchmarkLifecycleTransition) -> str:
+        """Returns the content of the service file."""
+        return KAFKA_SYSTEMD_SERVICE_TEMPLATE.format_map(
+            _ServiceValues(self._service_values(transition))
         )
 
     @override
@@ -258,32 +333,13 @@ class KafkaConfigManager(ConfigManager):
         self,
         transition: DPBenchmarkLifecycleTransition,
     ) -> bool:
-        if not (
-            os.path.exists(self.workload.paths.service)
-            and os.path.exists(self.workload.paths.workload_params)
-            and (values := self.get_execution_options())
-        ):
+        if not (self._files_exist() and self._execution_values):
             return False
-        values = values.dict() | {
-            "charm_root": os.environ.get("CHARM_DIR", ""),
-            "command": transition.value,
-            "target_hosts": values.db_info.hosts,
-        }
-        compare_svc = "\n".join(self.workload.read(self.workload.paths.service)) == self._render(
-            values=values,
-            template_file=None,
-            template_content=KAFKA_SYSTEMD_SERVICE_TEMPLATE,
-            dst_filepath=None,
-        )
-        compare_params = "\n".join(
-            self.workload.read(self.workload.paths.workload_params)
-        ) == self._render(
-            values=self.get_workload_params(),
-            template_file=None,
-            template_content=self.workload.workload_params_template,
-            dst_filepath=None,
-        )
-        return compare_svc and compare_params
+        paths = self.workload.paths
+        if self._read_rendered(paths.service) != self._service_content(transition):
+            # No need to render the workload parameters, the check has already failed
+            return False
+        return self._read_rendered(paths.workload_params) == self._workload_params_content()
 
     def get_worker_params(self) -> dict[str, Any]:
         """Return the workload parameters."""
@@ -293,12 +349,11 @@ class KafkaConfigManager(ConfigManager):
             "total_number_of_brokers": len(self.peer.units()) + 1,
             # We cannot have quotes nor brackets in this string.
             # Therefore, we render the entire line instead
-            "list_of_brokers_bootstrap": "bootstrap.servers={}".format(
-                ",".join(self.database.bootstrap_servers())
-            ),
+            # The hosts are already joined by the database model
+            "list_of_brokers_bootstrap": f"bootstrap.servers={db.target_hosts}",
             "username": db.username,
             "password": db.password,
-            "threads": self.config.get("threads", 1) if self.config.get("threads") > 0 else 1,
+            "threads": max(self._cfg.threads, 1),
         }
 
     def _render_worker_params(
@@ -317,9 +372,9 @@ class KafkaConfigManager(ConfigManager):
     def get_workload_params(self) -> dict[str, Any]:
         """Return the worker parameters."""
         return {
-            "partitionsPerTopic": self.config.get("parallel_processes"),
-            "duration": int(self.config.get("duration") / 60)
-            if self.config.get("duration") > 0
+            "partitionsPerTopic": self._cfg.parallel_processes,
+            "duration": int(self._cfg.duration / 60)
+            if self._cfg.duration > 0
             else TEN_YEARS_IN_MINUTES,
             "charm_root": os.environ.get("CHARM_DIR", ""),
         }
@@ -346,17 +401,21 @@ class KafkaConfigManager(ConfigManager):
     @override
     def prepare(self) -> bool:
         """Prepare the benchmark service."""
+        from charms.kafka.v0.client import NewTopic
+
         # First, clean if a topic already existed
         self.clean()
         try:
             topic = NewTopic(
                 name=self.database.state.get().db_name,
-                num_partitions=self.config.get("threads") * self.config.get("parallel_processes"),
+                num_partitions=self._cfg.threads * self._cfg.parallel_processes,
                 replication_factor=self.client.replication_factor,
             )
             self.client.create_topic(topic)
         except Exception as e:
-            logger.debug(f"Error creating topic: {e}")
+            logger.debug("Error creating topic: %s", e)
+        finally:
+            self._topics_cache.clear()
 
         # We may fail to create the topic, as the relation has been recently stablished
         return self.is_prepared()
@@ -365,9 +424,9 @@ class KafkaConfigManager(ConfigManager):
     def is_prepared(self) -> bool:
         """Checks if the benchmark service has passed its "prepare" status."""
         try:
-            return self.database.state.get().db_name in self.client._admin_client.list_topics()
+            return self.database.state.get().db_name in self._topics()
         except Exception as e:
-            logger.info(f"Error describing topic: {e}")
+            logger.info("Error describing topic: %s", e)
             return False
 
     @override
@@ -376,24 +435,32 @@ class KafkaConfigManager(ConfigManager):
         try:
             self.client.delete_topics([self.database.state.get().db_name])
         except Exception as e:
-            logger.info(f"Error deleting topic: {e}")
+            logger.info("Error deleting topic: %s", e)
+        finally:
+            self._topics_cache.clear()
         return self.is_cleaned()
 
     @override
     def is_cleaned(self) -> bool:
         """Checks if the benchmark service has passed its "prepare" status."""
         try:
-            return self.database.state.get().db_name not in self.client._admin_client.list_topics()
+            return self.database.state.get().db_name not in self._topics()
         except Exception as e:
-            logger.info(f"Error describing topic: {e}")
+            logger.info("Error describing topic: %s", e)
             return False
 
+    def _topics(self) -> set[str]:
+        """Returns the topics in the cluster, listing them at most once per TOPICS_TTL."""
+        return self._topics_cache.get(lambda: set(self.client._admin_client.list_topics()))
+
     @cached_property
-    def client(self) -> KafkaClient:
+    def client(self) -> "KafkaClient":
         """Return the Kafka client."""
+        from charms.kafka.v0.client import KafkaClient
+
         state = self.database.state.get()
         return KafkaClient(
-            servers=self.database.bootstrap_servers(),
+            servers=state.hosts,
             username=state.username,
             password=state.password,
             security_protocol="SASL_SSL" if (state.tls or state.tls_ca) else "SASL_PLAINTEXT",
@@ -410,7 +477,8 @@ class KafkaBenchmarkOperator(DPBenchmarkCharmBase):
         self.workload_params_template = KAFKA_WORKLOAD_PARAMS_TEMPLATE
 
         super().__init__(*args, db_relation_name=CLIENT_RELATION_NAME)
-        self.labels = ",".join([self.model.name, self.unit.name.replace("/", "-")])
+        unit_label = self.unit.name.replace("/", "-")
+        self.labels = f"{self.model.name},{unit_label}"
 
         self.database = KafkaDatabaseRelationHandler(
             self,
@@ -431,6 +499,8 @@ class KafkaBenchmarkOperator(DPBenchmarkCharmBase):
     @override
     def _on_install(self, event: EventBase) -> None:
         """Install the charm."""
+        import charms.operator_libs_linux.v0.apt as apt
+
         apt.add_package("openjdk-18-jre", update_cache=True)
 
     @override
@@ -456,9 +526,9 @@ class KafkaBenchmarkOperator(DPBenchmarkCharmBase):
         return super()._on_config_changed(event)
 
     @override
-    def supported_workloads(self) -> list[str]:
+    def supported_workloads(self) -> Sequence[str]:
         """List of supported workloads."""
-        return ["default"]
+        return SUPPORTED_WORKLOADS
 
 
 if __name__ == "__main__":
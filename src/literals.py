@@ -13,6 +13,9 @@ METRICS_PORT = 8088
 COS_AGENT_RELATION = "cos-agent"
 PEER_RELATION = "benchmark-peer"
 
+# The workloads are fixed for the charm, so they are kept in a constant tuple
+SUPPORTED_WORKLOADS = ("default",)
+
 
 class DPBenchmarkError(Exception):
     """Benchmark error."""
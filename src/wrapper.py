@@ -5,6 +5,7 @@
 """This script runs the benchmark tool, collects its output and forwards to prometheus."""
 
 import argparse
+import asyncio
 import os
 import re
 
@@ -75,7 +76,7 @@ class KafkaMainWrapper(MainWrapper):
         #     b10b22767f8063321c90bc9ee1b0aadc5902c31a/benchmark-framework/ \
         #     src/main/java/io/openmessaging/benchmark/WorkloadGenerator.java#L352
         # The report interval is hardcoded to 10 seconds
-        args.report_interval = 10
+        args = args.copy(update={"report_interval": 10})
         super().__init__(args)
         metrics = BenchmarkMetrics(
             options=MetricOptionsModel(
@@ -90,6 +91,8 @@ class KafkaMainWrapper(MainWrapper):
 class KafkaBenchmarkProcess(BenchmarkProcess):
     """This class models one of the processes being executed in the benchmark."""
 
+    __slots__ = ()
+
     @override
     def process_line(self, line: str) -> BaseModel | None:
         """Process the line and return the metric."""
@@ -100,58 +103,61 @@ class KafkaBenchmarkProcess(BenchmarkProcess):
 class KafkaBenchmarkManager(BenchmarkManager):
     """This class is in charge of managing all the processes in the benchmark run."""
 
+    __slots__ = ()
+
     matcher: KafkaBenchmarkSampleMatcher = KafkaBenchmarkSampleMatcher()
+    # Every output line goes through these patterns, so we compile them only once
+    patterns: dict[str, re.Pattern] = {
+        name: re.compile(pattern) for name, pattern in matcher.dict().items()
+    }
 
     @override
     def process_line(self, line: str) -> BaseModel | None:
         """Process the output of the process."""
+        patterns = self.patterns
         # First, check if we have a match:
         try:
-            if not (pub_rate := re.findall(self.matcher.produce_rate, line)):
+            if not (pub_rate := patterns["produce_rate"].search(line)):
                 # Nothing found, we can have an early return
                 return None
 
-            if not (
-                prod_percentiles := re.findall(self.matcher.produce_latency_percentiles, line)
-            ):
+            if not (prod_match := patterns["produce_latency_percentiles"].search(line)):
                 return None
 
-            if not (
-                delay_percentiles := re.findall(
-                    self.matcher.produce_latency_delay_percentiles, line
-                )
-            ):
+            if not (delay_match := patterns["produce_latency_delay_percentiles"].search(line)):
                 return None
 
+            prod_percentiles = prod_match.groups()
+            delay_percentiles = delay_match.groups()
             return KafkaBenchmarkSample(
-                produce_rate=float(pub_rate[0]),
-                produce_throughput=float(re.findall(self.matcher.produce_throughput, line)[0]),
-                produce_error_rate=float(re.findall(self.matcher.produce_error_rate, line)[0]),
-                produce_latency_avg=float(prod_percentiles[0][0]),
-                produce_latency_50=float(prod_percentiles[0][1]),
-                produce_latency_99=float(prod_percentiles[0][2]),
-                produce_latency_99_9=float(prod_percentiles[0][3]),
-                produce_latency_max=float(prod_percentiles[0][4]),
-                produce_delay_latency_avg=float(delay_percentiles[0][0]),
-                produce_delay_latency_50=float(delay_percentiles[0][1]),
-                produce_delay_latency_99=float(delay_percentiles[0][2]),
-                produce_delay_latency_99_9=float(delay_percentiles[0][3]),
-                produce_delay_latency_max=float(delay_percentiles[0][4]),
-                consume_rate=float(re.findall(self.matcher.consume_rate, line)[0]),
-                consume_throughput=float(re.findall(self.matcher.consume_throughput, line)[0]),
-                consume_backlog=float(re.findall(self.matcher.consume_backlog, line)[0]),
+                produce_rate=float(pub_rate.group(1)),
+                produce_throughput=float(patterns["produce_throughput"].search(line).group(1)),
+                produce_error_rate=float(patterns["produce_error_rate"].search(line).group(1)),
+                produce_latency_avg=float(prod_percentiles[0]),
+                produce_latency_50=float(prod_percentiles[1]),
+                produce_latency_99=float(prod_percentiles[2]),
+                produce_latency_99_9=float(prod_percentiles[3]),
+                produce_latency_max=float(prod_percentiles[4]),
+                produce_delay_latency_avg=float(delay_percentiles[0]),
+                produce_delay_latency_50=float(delay_percentiles[1]),
+                produce_delay_latency_99=float(delay_percentiles[2]),
+                produce_delay_latency_99_9=float(delay_percentiles[3]),
+                produce_delay_latency_max=float(delay_percentiles[4]),
+                consume_rate=float(patterns["consume_rate"].search(line).group(1)),
+                consume_throughput=float(patterns["consume_throughput"].search(line).group(1)),
+                consume_backlog=float(patterns["consume_backlog"].search(line).group(1)),
             )
         except Exception:
             return None
 
     @override
-    def start(self):
+    async def start(self):
         """Start the benchmark tool."""
-        for worker in self.workers:
-            worker.start()
+        # Spawn all the workers concurrently
+        await asyncio.gather(*(worker.start() for worker in self.workers))
         if self.model:
             # In Kafka, we start the manager after the workers
-            BenchmarkProcess.start(self)
+            await BenchmarkProcess.start(self)
 
 
 class KafkaWorkloadToProcessMapping(WorkloadToProcessMapping):
@@ -232,7 +238,7 @@ if __name__ == "__main__":
     # Parse the arguments as dictionary, using the same logic as:
     # https://github.com/python/cpython/blob/ \
     #     47c5a0f307cff3ed477528536e8de095c0752efa/Lib/argparse.py#L134
-    args = parser.parse_args()
-    args.command = BenchmarkCommand(parser.parse_args().command.lower())
-    main_wrapper = KafkaMainWrapper(WorkloadCLIArgsModel.parse_obj(args.__dict__))
+    args = vars(parser.parse_args())
+    args["command"] = BenchmarkCommand(args["command"].lower())
+    main_wrapper = KafkaMainWrapper(WorkloadCLIArgsModel.parse_obj(args))
     main_wrapper.run()
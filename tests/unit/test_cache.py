@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# Copyright 2024 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from benchmark.core.cache import TTLCache
+
+
+def test_ttl_cache_reuses_value_until_expired():
+    cache = TTLCache(1.0)
+    compute = MagicMock(side_effect=[1, 2])
+
+    with patch("benchmark.core.cache.time.monotonic", return_value=10.0):
+        assert cache.get(compute) == 1
+        assert cache.get(compute) == 1
+    with patch("benchmark.core.cache.time.monotonic", return_value=11.0):
+        assert cache.get(compute) == 2
+    assert compute.call_count == 2
+
+
+def test_ttl_cache_clear():
+    cache = TTLCache(60.0)
+    compute = MagicMock(side_effect=[1, 2])
+
+    assert cache.get(compute) == 1
+    cache.clear()
+    assert cache.get(compute) == 2
+
+
+def test_ttl_cache_does_not_keep_failures():
+    cache = TTLCache(60.0)
+    compute = MagicMock(side_effect=[OSError(), 1])
+
+    with pytest.raises(OSError):
+        cache.get(compute)
+    assert cache.get(compute) == 1
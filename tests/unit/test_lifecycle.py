@@ -121,3 +121,20 @@ def test_next_state_run_as_follower():
     lifecycle_manager.current = MagicMock(return_value=DPBenchmarkLifecycleState.AVAILABLE)
 
     assert lifecycle_manager.next(None) == DPBenchmarkLifecycleState.RUNNING
+
+
+def test_peers_state_returns_most_advanced_state():
+    config = MagicMock()
+    peers = MagicMock()
+    states = {
+        "this": MockPeerState(DPBenchmarkLifecycleState.AVAILABLE),
+        "unit/1": MockPeerState(DPBenchmarkLifecycleState.RUNNING),
+        "unit/2": MockPeerState(None),
+        "unit/3": MockPeerState(DPBenchmarkLifecycleState.PREPARING),
+    }
+    peers.this_unit = MagicMock(return_value="this")
+    peers.unit_state = MagicMock(side_effect=lambda unit: states[unit])
+    peers.units = MagicMock(return_value=["unit/1", "unit/2", "unit/3"])
+    lifecycle_manager = TestLifecycleManager(peers, config)
+
+    assert lifecycle_manager._peers_state() == DPBenchmarkLifecycleState.RUNNING
@@ -2,10 +2,14 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import asyncio
 import getpass
+import time
 from unittest.mock import MagicMock
 
 import pytest
+from prometheus_client import REGISTRY
+from pydantic import BaseModel
 
 import benchmark.wrapper.core as core
 import benchmark.wrapper.process as process
@@ -24,19 +28,21 @@ class TestBenchmarkManager(process.BenchmarkManager):
 ARGS = core.WorkloadCLIArgsModel(
     test_name="test",
     command=core.BenchmarkCommand.RUN,
+    workload="default",
     parallel_processes=1,
     threads=1,
     duration=0,
     run_count=1,
-    target_hosts="localhost",
     report_interval=10,
+    extra_labels="",
+    peers="localhost:8080",
 )
 
 
 @pytest.fixture
 def manager():
     proc = core.ProcessModel(
-        cmd="echo test && sleep 30s",
+        cmd='sh -c "echo test && sleep 30s"',
         user=getpass.getuser(),
     )
     mgr_proc = core.ProcessModel(
@@ -65,19 +71,100 @@ def manager():
 
 
 def test_exec(manager):
+    async def _run():
+        await manager.start()
+        assert manager.workers[0].status() == core.ProcessStatus.RUNNING
+        await manager._exec()
+
     try:
         manager.workers[0].process_line = MagicMock()
-        manager.workers[0].metrics.add = MagicMock()
+        manager.workers[0].metrics.add_many = MagicMock()
         manager.process_line = MagicMock()
-        manager.metrics.add = MagicMock()
+        manager.metrics.add_many = MagicMock()
 
-        manager.start()
-        assert manager.workers[0].status() == core.ProcessStatus.RUNNING
-        manager.run()
+        asyncio.run(_run())
         manager.workers[0].process_line.assert_called_once_with("test\n")
-        manager.workers[0].metrics.add.assert_called()
+        manager.workers[0].metrics.add_many.assert_called()
         assert manager.workers[0].status() == core.ProcessStatus.STOPPED
     except Exception:
         # Cleaning up zombies and leftovers
         manager.stop()
         raise
+
+
+class Sample(BaseModel):
+    rate: float
+
+
+def test_metrics_are_published_on_flush():
+    metrics = core.BenchmarkMetrics(
+        options=core.MetricOptionsModel(
+            label="test_flush",
+            extra_labels=["model", "unit"],
+            description="test",
+        )
+    )
+    labels = {"model": "model", "unit": "unit"}
+
+    metrics.add(Sample(rate=1.0))
+    metrics.add_many([Sample(rate=3.0), Sample(rate=2.0)])
+    assert REGISTRY.get_sample_value("test_flush_rate", labels) is None
+
+    metrics.flush()
+    assert REGISTRY.get_sample_value("test_flush_rate", labels) == 2.0
+
+
+@pytest.mark.parametrize("run_count", [0, 1])
+def test_run_loop_stops_the_process_after_duration(run_count):
+    args = ARGS.copy(update={"duration": 1, "run_count": run_count})
+    proc = TestBenchmarkProcess(
+        model=core.ProcessModel(cmd="sleep 30s", user=getpass.getuser()),
+        args=args,
+        metrics=core.BenchmarkMetrics(options=core.MetricOptionsModel()),
+    )
+
+    async def _run():
+        await proc.start()
+        await asyncio.wait_for(proc.run_loop(), timeout=10)
+
+    start = time.monotonic()
+    asyncio.run(_run())
+    # The loop must end at the deadline, not merely before the timeout above
+    assert time.monotonic() - start < args.duration + 2
+    assert proc.status() == core.ProcessStatus.STOPPED
+
+
+def test_stop_keeps_the_error_of_a_failed_worker():
+    metrics = core.BenchmarkMetrics(options=core.MetricOptionsModel())
+    worker = TestBenchmarkProcess(
+        model=core.ProcessModel(cmd='sh -c "exit 1"', user=getpass.getuser()),
+        args=ARGS,
+        metrics=metrics,
+    )
+    manager = TestBenchmarkManager(
+        model=core.ProcessModel(cmd="sleep 30s", user=getpass.getuser()),
+        args=ARGS,
+        metrics=metrics,
+        unstarted_workers=[worker],
+    )
+
+    async def _run():
+        await manager.start()
+        await asyncio.wait_for(worker.run_loop(), timeout=10)
+        assert worker.status() == core.ProcessStatus.ERROR
+        manager.stop()
+        # Reap the killed manager process
+        await manager._proc.wait()
+
+    asyncio.run(_run())
+    assert worker.status() == core.ProcessStatus.ERROR
+    assert manager.status() == core.ProcessStatus.STOPPED
+
+
+def test_flush_metrics_returns_on_non_positive_interval(manager):
+    manager.args = ARGS.copy(update={"report_interval": 0})
+    manager.metrics.flush = MagicMock()
+
+    # It would otherwise keep looping until the timeout fails the test
+    asyncio.run(asyncio.wait_for(manager._flush_metrics(), timeout=1))
+    manager.metrics.flush.assert_not_called()